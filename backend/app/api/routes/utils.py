@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from pydantic.networks import EmailStr
 
 from app.api.deps import get_current_active_superuser
+from app.core.config import settings
 from app.models import Message
 from app.utils import generate_test_email, send_email
 
@@ -13,12 +14,15 @@ router = APIRouter()
     dependencies=[Depends(get_current_active_superuser)],
     status_code=201,
 )
-def test_email(email_to: EmailStr) -> Message:
+def test_email(email_to: EmailStr, background_tasks: BackgroundTasks) -> Message:
     """
     Test emails.
     """
+    if not settings.emails_enabled:
+        raise HTTPException(status_code=500, detail="Emails are not configured")
     email_data = generate_test_email(email_to=email_to)
-    send_email(
+    background_tasks.add_task(
+        send_email,
         email_to=email_to,
         subject=email_data.subject,
         html_content=email_data.html_content,
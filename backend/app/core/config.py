@@ -55,6 +55,10 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     # 60 minutes * 24 hours * 8 days = 8 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # bcrypt cost factor for user passwords
+    BCRYPT_ROUNDS: int = 12
+    # Random high-entropy tokens don't need the work factor of user passwords
+    SESSION_TOKEN_BCRYPT_ROUNDS: int = 4
     DOMAIN: str = "localhost"
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
 
@@ -77,6 +81,8 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str = ""
+    DB_POOL_SIZE: int = 20
+    DB_POOL_OVERFLOW: int = 30
 
     @computed_field  # type: ignore[misc]
     @property
@@ -1,10 +1,30 @@
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import sessionmaker
 from sqlmodel import Session, create_engine, select
 
-from app import crud
 from app.core.config import settings
-from app.models import User, UserCreate
+from app.core.security import get_password_hash
+from app.models import User
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+_DSN = str(settings.SQLALCHEMY_DATABASE_URI)
+
+# LIFO keeps reusing the most recently returned (warm) connections and lets idle
+# overflow connections time out, pre-ping and recycle avoid handing out dead ones
+engine = create_engine(
+    _DSN,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_POOL_OVERFLOW,
+    pool_timeout=30,
+    pool_recycle=1800,
+    pool_pre_ping=True,
+    pool_use_lifo=True,
+)
+
+# Configured once and reused for every session. Objects are not expired on commit,
+# so attributes set in Python don't need a new SELECT to be read back after commit
+SessionLocal = sessionmaker(
+    bind=engine, class_=Session, expire_on_commit=False, autoflush=False
+)
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -16,8 +36,10 @@ def init_db(session: Session) -> None:
     """
     Initializes the database session. This method is responsible for setting up the initial state of the database. 
 
-    Initially, it tries to fetch the first superuser from the database. If the superuser is not found, it creates a superuser account. 
-    This superuser account is created with the email and password obtained from the environment settings.
+    Initially, it checks whether the first superuser exists in the database. If the superuser is not found, it creates a superuser account. 
+    This superuser account is created with the email and password obtained from the environment settings, using an
+    INSERT ... ON CONFLICT DO NOTHING so concurrent starts don't fail on the unique email. The password is only hashed
+    when the account has to be created.
     
     Note: Tables should be manually created with Alembic migrations. 
     However, if you choose not to use migrations, the tables can be created by un-commenting the lines of code provided. 
@@ -38,13 +60,18 @@ def init_db(session: Session) -> None:
     # This works because the models are already imported and registered from app.models
     # SQLModel.metadata.create_all(engine)
 
-    user = session.exec(
-        select(User).where(User.email == settings.FIRST_SUPERUSER)
+    user_id = session.exec(
+        select(User.id).where(User.email == settings.FIRST_SUPERUSER)
     ).first()
-    if not user:
-        user_in = UserCreate(
-            email=settings.FIRST_SUPERUSER,
-            password=settings.FIRST_SUPERUSER_PASSWORD,
-            is_superuser=True,
+    if user_id is None:
+        statement = (
+            insert(User)
+            .values(
+                email=settings.FIRST_SUPERUSER,
+                hashed_password=get_password_hash(settings.FIRST_SUPERUSER_PASSWORD),
+                is_superuser=True,
+            )
+            .on_conflict_do_nothing(index_elements=["email"])
         )
-        user = crud.create_user(session=session, user_create=user_in)
+        session.execute(statement)
+        session.commit()
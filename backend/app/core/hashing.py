@@ -0,0 +1,59 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.core.security import verify_password
+
+
+def _new_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+# bcrypt is CPU bound, run it in separate processes so that several hashes can be
+# computed in parallel without blocking the event loop. Workers are started with
+# "spawn" because forking a process that already runs server threads is unsafe.
+_pool = _new_pool()
+_pool_lock = threading.Lock()
+
+
+def _replace_broken_pool(broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            broken.shutdown(wait=False)
+            _pool = _new_pool()
+        return _pool
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifies a plain text password against a bcrypt hash without blocking the event loop.
+
+    The `verify_password` call is dispatched to a process pool and awaited, so other
+    requests can be served while the hash is being computed. If a worker died (e.g. it
+    was OOM killed) the pool is broken for good, so it is replaced and the call is
+    retried once on the new pool.
+
+    Args:
+        plain_password (str): The plain text password to verify.
+        hashed_password (str): The hashed password to verify against.
+
+    Returns:
+        bool: True if the plain text password matches the hashed password, False otherwise.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _pool
+    try:
+        return await loop.run_in_executor(
+            pool, verify_password, plain_password, hashed_password
+        )
+    except BrokenProcessPool:
+        pool = _replace_broken_pool(pool)
+        return await loop.run_in_executor(
+            pool, verify_password, plain_password, hashed_password
+        )
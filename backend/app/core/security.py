@@ -1,15 +1,94 @@
-from datetime import datetime, timedelta
+import base64
+import hmac
+import json
+import os
+import threading
+import time
+from datetime import timedelta
 from typing import Any
 
-from jose import jwt
-from passlib.context import CryptContext
+import bcrypt
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+ALGORITHM = "HS256"
 
 
-ALGORITHM = "HS256"
+# bcrypt uses the standard base64 bit layout with its own alphabet and no padding
+_BCRYPT_B64 = bytes.maketrans(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/",
+    b"./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789",
+)
+
+
+class _SaltBuffer:
+    """
+    Serves 16 byte bcrypt salts from a block of random bytes read ahead from the OS,
+    so generating a salt doesn't need an `os.urandom` call for every password hash.
+
+    The block is discarded in forked children, so worker processes never share salts.
+    """
+
+    def __init__(self, size: int = 1024) -> None:
+        self._size = size
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._buffer = b""
+        self._offset = 0
+
+    def take(self, n: int = 16) -> bytes:
+        with self._lock:
+            if self._offset + n > len(self._buffer):
+                self._buffer = os.urandom(self._size)
+                self._offset = 0
+            data = self._buffer[self._offset : self._offset + n]
+            self._offset += n
+        return data
+
+    def gensalt(self, rounds: int) -> bytes:
+        salt = base64.b64encode(self.take()).rstrip(b"=").translate(_BCRYPT_B64)
+        return b"$2b$%02d$" % rounds + salt
+
+
+_salts = _SaltBuffer()
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# The header never changes and the HMAC key schedule only depends on SECRET_KEY, so
+# both are computed once, signing copies the keyed state instead of re-keying
+_JWT_HEADER = _b64url(
+    json.dumps({"alg": ALGORITHM, "typ": "JWT"}, separators=(",", ":")).encode()
+)
+_SIGNER = hmac.new(settings.SECRET_KEY.encode("utf-8"), digestmod="sha256")
+
+
+def _hs256_sign(signing_input: bytes) -> bytes:
+    signer = _SIGNER.copy()
+    signer.update(signing_input)
+    return signer.digest()
+
+
+def encode_jwt(payload: dict[str, Any]) -> str:
+    """
+    Encodes a payload into an HS256 JSON Web Token signed with the application's secret key.
+
+    The output is a standard compact JWT, so it can be decoded with `jwt.decode` from PyJWT.
+
+    Args:
+        payload (dict[str, Any]): The claims to encode, they must be JSON serializable.
+
+    Returns:
+        str: The encoded JWT as a string.
+    """
+    claims = _b64url(json.dumps(payload, separators=(",", ":")).encode())
+    signing_input = _JWT_HEADER + b"." + claims
+    return (signing_input + b"." + _b64url(_hs256_sign(signing_input))).decode("ascii")
 
 
 def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
@@ -24,15 +103,15 @@ def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
     subject (str | Any): The subject to be encoded in the JWT. Usually, this is the identifier
                          of the user for whom the token is created.
     expires_delta (timedelta): The duration for which the JWT is valid. This value is added 
-                               to the current UTC time to determine the expiration time 
+                               to the current epoch time to determine the expiration time 
                                ('exp') of the JWT.
 
     Returns:
     str: The encoded JWT as a string.
     """
-    expire = datetime.utcnow() + expires_delta
+    expire = int(time.time()) + int(expires_delta.total_seconds())
     to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = encode_jwt(to_encode)
     return encoded_jwt
 
 
@@ -40,10 +119,9 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifies if a plain text password matches a hashed password.
     
-    This method uses the password context `pwd_context` to compare
-    a plain text password with a hashed version. The `pwd_context`
-    should have been previously set up and should use the same algorithm
-    that was used to hash the password.
+    This method calls `bcrypt.checkpw` directly to compare a plain text
+    password with a bcrypt hash. The cost factor and salt are read from
+    the hash itself, so hashes created with any number of rounds are accepted.
     
     Args:
         plain_password (str): The plain text password to verify.
@@ -52,13 +130,17 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: True if the plain text password matches the hashed password, False otherwise.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return bcrypt.checkpw(
+        plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+    )
 
 
-def get_password_hash(password: str) -> str:
+def get_password_hash(password: str, *, rounds: int | None = None) -> str:
     """
-    This method takes a password as a string and returns its hashed version. The hashing is done 
-    using a password context object (pwd_context) which must be defined elsewhere in the code.
+    This method takes a password as a string and returns its hashed version. The hashing is done
+    directly with `bcrypt.hashpw` using a random salt taken from a read-ahead buffer, producing a `$2b$` hash.
+    The cost factor defaults to `settings.BCRYPT_ROUNDS`; when hashing random tokens rather than
+    user passwords, pass `rounds=settings.SESSION_TOKEN_BCRYPT_ROUNDS` instead.
     
     Hashing a password is a security measure to prevent the original password from being known 
     if the data is compromised. The hashed password can be stored and used for comparison with user input 
@@ -66,8 +148,10 @@ def get_password_hash(password: str) -> str:
     
     Args:
         password (str): The password to be hashed.
+        rounds (int | None): The bcrypt cost factor. Defaults to `settings.BCRYPT_ROUNDS`.
 
     Returns:
         str: The hashed version of the input password.
     """
-    return pwd_context.hash(password)
+    salt = _salts.gensalt(rounds or settings.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
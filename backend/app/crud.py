@@ -1,21 +1,55 @@
-from typing import Any
+import hmac
+import threading
+from typing import Any, NamedTuple
 
+from cachetools import TTLCache
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import bindparam
 from sqlmodel import Session, select
 
-from app.core.security import get_password_hash, verify_password
+from app.core.config import settings
+from app.core.hashing import averify_password
+from app.core.security import get_password_hash
 from app.models import Item, ItemCreate, User, UserCreate, UserUpdate
 
 
+class UserAuth(NamedTuple):
+    """The result of a successful authentication, without the password hash."""
+
+    id: int
+    is_active: bool
+
+
+# Passwords that recently passed bcrypt verification, keyed by an HMAC of the user id
+# and the password, mapped to the hash they matched. An entry is only trusted while it
+# equals the hash currently stored for the user, so any password change, whatever code
+# path or process wrote it, invalidates it.
+_verified_passwords: TTLCache[bytes, str] = TTLCache(maxsize=10_000, ttl=60)
+_verified_passwords_lock = threading.Lock()
+
+# Built once, the email is passed as a bound parameter on each execution, and the
+# compiled SQL is reused from the engine's compiled cache
+_USER_BY_EMAIL_STMT = select(User).where(User.email == bindparam("email"))
+_USER_AUTH_BY_EMAIL_STMT = select(User.id, User.hashed_password, User.is_active).where(
+    User.email == bindparam("email")
+)
+
+
+def _verified_password_key(user_id: int, password: str) -> bytes:
+    msg = user_id.to_bytes(8, "big") + password.encode()
+    return hmac.new(settings.SECRET_KEY.encode(), msg, "sha256").digest()
+
+
 def create_user(*, session: Session, user_create: UserCreate) -> User:
     """
     This method is used to create a new user in the database. 
 
-    It first validates the data from the 'user_create' object using the 'model_validate' method of 'User' class.
+    It builds the 'User' object directly from the fields of the already validated 'user_create' object, without validating them again.
     This object must include a 'password' attribute, which will be hashed before being added to the database for security purposes. 
 
     Then, it adds the created object to the session (which represents the transaction). It commits the transaction to the database to save the changes permanently. 
 
-    The method also refreshes the session to synchronize it with the current database status.
+    The primary key generated by the database is populated by the INSERT itself, so no extra SELECT is issued to refresh the object.
 
     Finally, it returns the created 'User' object with all attributes which were added to the database.
 
@@ -26,12 +60,12 @@ def create_user(*, session: Session, user_create: UserCreate) -> User:
     Returns:
     User: The created User object with information that was stored in the database.
     """
-    db_obj = User.model_validate(
-        user_create, update={"hashed_password": get_password_hash(user_create.password)}
+    db_obj = User(
+        **user_create.model_dump(exclude={"password"}),
+        hashed_password=get_password_hash(user_create.password),
     )
     session.add(db_obj)
     session.commit()
-    session.refresh(db_obj)
     return db_obj
 
 
@@ -66,7 +100,6 @@ def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> Any:
     db_user.sqlmodel_update(user_data, update=extra_data)
     session.add(db_user)
     session.commit()
-    session.refresh(db_user)
     return db_user
 
 
@@ -81,18 +114,51 @@ def get_user_by_email(*, session: Session, email: str) -> User | None:
     Returns:
         User | None: Returns the User object if found. If no user is found with the provided email, return None.
     """
-    statement = select(User).where(User.email == email)
-    session_user = session.exec(statement).first()
+    session_user = session.exec(_USER_BY_EMAIL_STMT, params={"email": email}).first()
     return session_user
 
 
-def authenticate(*, session: Session, email: str, password: str) -> User | None:
+def get_user_auth_tuple(
+    *, session: Session, email: str
+) -> tuple[int, str, bool] | None:
+    """
+    Fetches only the columns needed to authenticate the user with the given email.
+
+    Selecting the id, hashed password and active flag instead of the whole row avoids building a User object
+    and adding it to the session's identity map on every login.
+
+    Args:
+        session (Session): The database connection session.
+        email (str): The email of the user to be fetched.
+
+    Returns:
+        tuple[int, str, bool] | None: The user's id, hashed password and active flag if found. If no user is found with
+        the provided email, return None.
+    """
+    row = session.exec(_USER_AUTH_BY_EMAIL_STMT, params={"email": email}).first()
+    if row is None:
+        return None
+    user_id, hashed_password, is_active = row
+    if user_id is None:
+        return None
+    return user_id, hashed_password, is_active
+
+
+async def authenticate(
+    *, session: Session, email: str, password: str
+) -> UserAuth | None:
     """
     Authenticates a user based on the provided email and password.
 
-    This method first retrieves the user details from the database using the provided email. If no user is found with 
-    the given email, it returns None. If a user is found, it verifies the provided password with the stored hashed password.
-    If the password is verified, it returns the user details; otherwise, it returns None.
+    This method first retrieves the user's id, hashed password and active flag from the database using the provided
+    email. If no user is found with the given email, it returns None. If a user is found, it verifies the provided
+    password with the stored hashed password. If the password is verified, it returns the user's id and active flag;
+    otherwise, it returns None. Callers that need the full User can load it with `session.get(User, user_auth.id)`.
+    The database lookup runs in the threadpool and the bcrypt verification in a process pool, so the event loop
+    is not blocked by either of them.
+    Successful verifications are cached for a short time, so repeated logins with the same password skip bcrypt.
+    A cached entry is only used while it matches the hash currently stored in the database, which is what
+    invalidates it when the password changes.
 
     Args:
         session (Session): A Session object representing the database session to use for queries.
@@ -100,26 +166,35 @@ def authenticate(*, session: Session, email: str, password: str) -> User | None:
         password (str): The plaintext password provided by the user to use for authentication.
 
     Returns:
-        User | None: If the user is found and the password is verified, it returns a User object. If the user is not
-        found or the password is not verified, it returns None.
+        UserAuth | None: If the user is found and the password is verified, it returns the user's id and active flag.
+        If the user is not found or the password is not verified, it returns None.
     """
-    db_user = get_user_by_email(session=session, email=email)
-    if not db_user:
-        return None
-    if not verify_password(password, db_user.hashed_password):
+    user_auth = await run_in_threadpool(
+        get_user_auth_tuple, session=session, email=email
+    )
+    if not user_auth:
         return None
-    return db_user
+    user_id, hashed_password, is_active = user_auth
+    key = _verified_password_key(user_id, password)
+    with _verified_passwords_lock:
+        cached_hash = _verified_passwords.get(key)
+    if cached_hash != hashed_password:
+        if not await averify_password(password, hashed_password):
+            return None
+        with _verified_passwords_lock:
+            _verified_passwords[key] = hashed_password
+    return UserAuth(id=user_id, is_active=is_active)
 
 
 def create_item(*, session: Session, item_in: ItemCreate, owner_id: int) -> Item:
     """
     This method creates a new item in the database.
 
-    It first validates the incoming item data (`item_in`) by using the `model_validate` method of the `Item` class.
-    The `model_validate` method also updates the `owner_id` field of the item with the provided `owner_id`.
+    It builds the `Item` directly from the fields of the already validated incoming item data (`item_in`),
+    setting the `owner_id` field of the item to the provided `owner_id`.
 
-    After the validation and updation, it adds the new item to the current database session and then commits the session
-    to save the changes in the database. It then refreshes the session to synchronize it with the current state of the database.
+    It then adds the new item to the current database session and then commits the session
+    to save the changes in the database. The generated id is returned by the INSERT, so the item is not refreshed afterwards.
 
     Finally, it returns the newly created item.
 
@@ -131,8 +206,7 @@ def create_item(*, session: Session, item_in: ItemCreate, owner_id: int) -> Item
     Returns:
         Item: The newly created item.
     """
-    db_item = Item.model_validate(item_in, update={"owner_id": owner_id})
+    db_item = Item(**item_in.model_dump(), owner_id=owner_id)
     session.add(db_item)
     session.commit()
-    session.refresh(db_item)
     return db_item
@@ -1,8 +1,6 @@
 import logging
 
-from sqlmodel import Session
-
-from app.core.db import engine, init_db
+from app.core.db import SessionLocal, init_db
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -10,7 +8,7 @@ logger = logging.getLogger(__name__)
 
 def init() -> None:
     """
-    This method initiates a session with the database using the global engine. 
+    This method initiates a session with the database using the global session factory. 
     Within this session, the database is then initialized through the 'init_db' method.
     
     The function doesn't return any value. It's primarily used for setting up 
@@ -22,7 +20,7 @@ def init() -> None:
     Returns:
         None
     """
-    with Session(engine) as session:
+    with SessionLocal() as session:
         init_db(session)
 
 
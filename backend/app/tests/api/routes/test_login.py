@@ -58,6 +58,19 @@ def test_recovery_password(
         assert r.json() == {"message": "Password recovery email sent"}
 
 
+def test_recovery_password_emails_disabled(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    with patch("app.core.config.settings.SMTP_HOST", None):
+        email = "test@example.com"
+        r = client.post(
+            f"{settings.API_V1_STR}/password-recovery/{email}",
+            headers=normal_user_token_headers,
+        )
+        assert r.status_code == 500
+        assert r.json() == {"detail": "Emails are not configured"}
+
+
 def test_recovery_password_user_not_exits(
     client: TestClient, normal_user_token_headers: dict[str, str]
 ) -> None:
@@ -0,0 +1,16 @@
+from unittest.mock import patch
+
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.db import init_db
+from app.models import User
+
+
+def test_init_db_existing_superuser_skips_hashing(db: Session) -> None:
+    with patch("app.core.db.get_password_hash") as hash_mock:
+        init_db(db)
+    hash_mock.assert_not_called()
+    users = db.exec(select(User).where(User.email == settings.FIRST_SUPERUSER)).all()
+    assert len(users) == 1
+    assert users[0].is_superuser
@@ -0,0 +1,23 @@
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.core import hashing
+from app.core.security import get_password_hash
+
+
+def test_averify_password() -> None:
+    hashed_password = get_password_hash("password", rounds=4)
+    assert asyncio.run(hashing.averify_password("password", hashed_password))
+    assert not asyncio.run(hashing.averify_password("incorrect", hashed_password))
+
+
+def test_averify_password_recovers_from_broken_pool() -> None:
+    # Kill a worker, like an OOM kill would, which breaks the whole pool
+    with pytest.raises(BrokenProcessPool):
+        hashing._pool.submit(os._exit, 1).result()
+    hashed_password = get_password_hash("password", rounds=4)
+    assert asyncio.run(hashing.averify_password("password", hashed_password))
+    assert asyncio.run(hashing.averify_password("password", hashed_password))
@@ -1,8 +1,10 @@
+import asyncio
+
 from fastapi.encoders import jsonable_encoder
 from sqlmodel import Session
 
 from app import crud
-from app.core.security import verify_password
+from app.core.security import get_password_hash, verify_password
 from app.models import User, UserCreate, UserUpdate
 from app.tests.utils.utils import random_email, random_lower_string
 
@@ -21,15 +23,18 @@ def test_authenticate_user(db: Session) -> None:
     password = random_lower_string()
     user_in = UserCreate(email=email, password=password)
     user = crud.create_user(session=db, user_create=user_in)
-    authenticated_user = crud.authenticate(session=db, email=email, password=password)
+    authenticated_user = asyncio.run(
+        crud.authenticate(session=db, email=email, password=password)
+    )
     assert authenticated_user
-    assert user.email == authenticated_user.email
+    assert authenticated_user.id == user.id
+    assert authenticated_user.is_active is True
 
 
 def test_not_authenticate_user(db: Session) -> None:
     email = random_email()
     password = random_lower_string()
-    user = crud.authenticate(session=db, email=email, password=password)
+    user = asyncio.run(crud.authenticate(session=db, email=email, password=password))
     assert user is None
 
 
@@ -89,3 +94,39 @@ def test_update_user(db: Session) -> None:
     assert user_2
     assert user.email == user_2.email
     assert verify_password(new_password, user_2.hashed_password)
+
+
+def test_authenticate_user_after_password_update(db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user_in = UserCreate(email=email, password=password)
+    user = crud.create_user(session=db, user_create=user_in)
+    assert asyncio.run(crud.authenticate(session=db, email=email, password=password))
+    new_password = random_lower_string()
+    user_in_update = UserUpdate(password=new_password)
+    crud.update_user(session=db, db_user=user, user_in=user_in_update)
+    old_user = asyncio.run(
+        crud.authenticate(session=db, email=email, password=password)
+    )
+    assert old_user is None
+    new_user = asyncio.run(
+        crud.authenticate(session=db, email=email, password=new_password)
+    )
+    assert new_user
+    assert new_user.id == user.id
+
+
+def test_authenticate_user_after_password_hash_change(db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user_in = UserCreate(email=email, password=password)
+    user = crud.create_user(session=db, user_create=user_in)
+    assert asyncio.run(crud.authenticate(session=db, email=email, password=password))
+    # Routes like reset-password write the hash directly, without crud.update_user
+    user.hashed_password = get_password_hash(random_lower_string())
+    db.add(user)
+    db.commit()
+    old_user = asyncio.run(
+        crud.authenticate(session=db, email=email, password=password)
+    )
+    assert old_user is None
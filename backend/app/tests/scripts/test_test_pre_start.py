@@ -1,19 +1,13 @@
 from unittest.mock import MagicMock, patch
 
-from sqlmodel import select
-
 from app.tests_pre_start import init, logger
 
 
 def test_init_successful_connection() -> None:
     engine_mock = MagicMock()
-
-    session_mock = MagicMock()
-    exec_mock = MagicMock(return_value=True)
-    session_mock.configure_mock(**{"exec.return_value": exec_mock})
+    connection_mock = engine_mock.connect.return_value.__enter__.return_value
 
     with (
-        patch("sqlmodel.Session", return_value=session_mock),
         patch.object(logger, "info"),
         patch.object(logger, "error"),
         patch.object(logger, "warn"),
@@ -28,6 +22,6 @@ def test_init_successful_connection() -> None:
             connection_successful
         ), "The database connection should be successful and not raise an exception."
 
-        assert session_mock.exec.called_once_with(
-            select(1)
-        ), "The session should execute a select statement once."
+        assert (
+            connection_mock.execute.call_count == 1
+        ), "The connection should execute a select statement once."
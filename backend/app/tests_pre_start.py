@@ -1,29 +1,32 @@
 import logging
 
-from sqlalchemy import Engine
-from sqlmodel import Session, select
-from tenacity import after_log, before_log, retry, stop_after_attempt, wait_fixed
+from sqlalchemy import Engine, text
+from tenacity import after_log, before_log, retry, stop_after_delay, wait_exponential
 
 from app.core.db import engine
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-max_tries = 60 * 5  # 5 minutes
-wait_seconds = 1
+max_wait_seconds = 60 * 5  # 5 minutes
+# 0.1s, 0.2s, 0.4s, ... capped at 2s, so a DB that is up quickly is detected quickly
+wait_min_seconds = 0.1
+wait_max_seconds = 2.0
 
 
 @retry(
-    stop=stop_after_attempt(max_tries),
-    wait=wait_fixed(wait_seconds),
+    stop=stop_after_delay(max_wait_seconds),
+    wait=wait_exponential(
+        multiplier=wait_min_seconds, min=wait_min_seconds, max=wait_max_seconds
+    ),
     before=before_log(logger, logging.INFO),
     after=after_log(logger, logging.WARN),
 )
 def init(db_engine: Engine) -> None:
     try:
-        # Try to create session to check if DB is awake
-        with Session(db_engine) as session:
-            session.exec(select(1))
+        # Try to open a connection to check if DB is awake
+        with db_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
     except Exception as e:
         logger.error(e)
         raise e
@@ -1,14 +1,40 @@
 import logging
+import threading
+import time
 from dataclasses import dataclass
-from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
+from urllib.parse import quote
 
 import emails  # type: ignore
-from jinja2 import Template
-from jose import JWTError, jwt
+import jwt
+from emails.backend.factory import ObjectFactory  # type: ignore
+from emails.backend.smtp import SMTPBackend  # type: ignore
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jwt.exceptions import InvalidTokenError
 
 from app.core.config import settings
+from app.core.security import encode_jwt
+
+# Templates are parsed once and kept in memory, the build output doesn't change at runtime
+_email_templates = Environment(
+    loader=FileSystemLoader(Path(__file__).parent / "email-templates" / "build"),
+    autoescape=select_autoescape(["html"]),
+    auto_reload=False,
+    cache_size=64,
+)
+
+
+# Settings used for every generated email, read once instead of on each call
+_SERVER_HOST = str(settings.server_host)
+_PROJECT_NAME = settings.PROJECT_NAME
+_RESET_HOURS = settings.EMAIL_RESET_TOKEN_EXPIRE_HOURS
+_RESET_PASSWORD_URL = f"{_SERVER_HOST}/reset-password?token="
+
+# SMTP backends keyed by their options, shared by all messages so the connection to the
+# server is kept open between sends instead of being re-established for each email
+_smtp_pool = ObjectFactory(cls=SMTPBackend)
+_smtp_lock = threading.Lock()
 
 
 @dataclass
@@ -21,8 +47,9 @@ def render_email_template(*, template_name: str, context: dict[str, Any]) -> str
     """
     Renders an email template with a given context.
 
-    This method reads a template file from the 'email-templates/build' directory relative to the current file. 
-    It then uses the Jinja2 Template to render this template with the provided context.
+    This method loads a template file from the 'email-templates/build' directory relative to the current file
+    through a shared Jinja2 Environment, which parses each template only once, and renders it with the provided context.
+    Values from the context are HTML escaped.
 
     Args:
         template_name (str): The name of the template file. This should include any file extension e.g. 'example.html'.
@@ -33,13 +60,10 @@ def render_email_template(*, template_name: str, context: dict[str, Any]) -> str
         str: The rendered email template.
 
     Raises:
-        FileNotFoundError: If the specified template file does not exist.
+        jinja2.exceptions.TemplateNotFound: If the specified template file does not exist.
         jinja2.exceptions.TemplateError: If there is an error in rendering the template.
     """
-    template_str = (
-        Path(__file__).parent / "email-templates" / "build" / template_name
-    ).read_text()
-    html_content = Template(template_str).render(context)
+    html_content = _email_templates.get_template(template_name).render(context)
     return html_content
 
 
@@ -57,7 +81,10 @@ def send_email(
     SMTP options based on settings. If SMTP requires TLS or SSL, these are configured as well. 
 
     If SMTP username and password are provided in settings, these are also included in the SMTP options. 
-    The email is then sent to the recipient, and the result of the send operation is logged.
+    The email is then sent to the recipient over a shared SMTP connection, and the result of the send operation is logged.
+
+    Sending blocks until the SMTP conversation is over, so routes should schedule it with
+    `BackgroundTasks.add_task` instead of calling it directly.
 
     Parameters:
     email_to (str): The recipient's email address.
@@ -82,7 +109,8 @@ def send_email(
         smtp_options["user"] = settings.SMTP_USER
     if settings.SMTP_PASSWORD:
         smtp_options["password"] = settings.SMTP_PASSWORD
-    response = message.send(to=email_to, smtp=smtp_options)
+    with _smtp_lock:
+        response = message.send(to=email_to, smtp=_smtp_pool[smtp_options])
     logging.info(f"send email result: {response}")
 
 
@@ -106,11 +134,10 @@ def generate_test_email(email_to: str) -> EmailData:
     has two properties: html_content (str) representing the body of the email, and subject 
     (str) representing the email's subject.
     """
-    project_name = settings.PROJECT_NAME
-    subject = f"{project_name} - Test email"
+    subject = f"{_PROJECT_NAME} - Test email"
     html_content = render_email_template(
         template_name="test_email.html",
-        context={"project_name": settings.PROJECT_NAME, "email": email_to},
+        context={"project_name": _PROJECT_NAME, "email": email_to},
     )
     return EmailData(html_content=html_content, subject=subject)
 
@@ -118,7 +145,7 @@ def generate_test_email(email_to: str) -> EmailData:
 def generate_reset_password_email(email_to: str, email: str, token: str) -> EmailData:
     """
     This method generates an email with a link to reset password for a user. It uses pre-defined settings for 
-    the project name, the server host, and the life span of the email reset token.
+    the project name, the server host, and the life span of the email reset token, read once when the module is loaded.
 
     Args:
         email_to (str): The recipient's email address where the reset password email will be sent.
@@ -129,19 +156,18 @@ def generate_reset_password_email(email_to: str, email: str, token: str) -> Emai
         EmailData: An object containing the HTML content and the subject of the email.
             
     The email includes a link to reset the password. This link is composed with the server host and the unique 
-    reset token. The link is valid for a certain number of hours defined in the settings. The email subject includes 
+    reset token, URL encoded. The link is valid for a certain number of hours defined in the settings. The email subject includes 
     the project name and the user's email address.
     """
-    project_name = settings.PROJECT_NAME
-    subject = f"{project_name} - Password recovery for user {email}"
-    link = f"{settings.server_host}/reset-password?token={token}"
+    subject = f"{_PROJECT_NAME} - Password recovery for user {email}"
+    link = _RESET_PASSWORD_URL + quote(token, safe="")
     html_content = render_email_template(
         template_name="reset_password.html",
         context={
-            "project_name": settings.PROJECT_NAME,
+            "project_name": _PROJECT_NAME,
             "username": email,
             "email": email_to,
-            "valid_hours": settings.EMAIL_RESET_TOKEN_EXPIRE_HOURS,
+            "valid_hours": _RESET_HOURS,
             "link": link,
         },
     )
@@ -166,16 +192,15 @@ def generate_new_account_email(
     Returns:
         EmailData: A namedtuple with the HTML content and subject of the email.
     """
-    project_name = settings.PROJECT_NAME
-    subject = f"{project_name} - New account for user {username}"
+    subject = f"{_PROJECT_NAME} - New account for user {username}"
     html_content = render_email_template(
         template_name="new_account.html",
         context={
-            "project_name": settings.PROJECT_NAME,
+            "project_name": _PROJECT_NAME,
             "username": username,
             "password": password,
             "email": email_to,
-            "link": settings.server_host,
+            "link": _SERVER_HOST,
         },
     )
     return EmailData(html_content=html_content, subject=subject)
@@ -199,15 +224,9 @@ def generate_password_reset_token(email: str) -> str:
         str: The encoded JWT token.
 
     """
-    delta = timedelta(hours=settings.EMAIL_RESET_TOKEN_EXPIRE_HOURS)
-    now = datetime.utcnow()
-    expires = now + delta
-    exp = expires.timestamp()
-    encoded_jwt = jwt.encode(
-        {"exp": exp, "nbf": now, "sub": email},
-        settings.SECRET_KEY,
-        algorithm="HS256",
-    )
+    now = int(time.time())
+    exp = now + _RESET_HOURS * 3600
+    encoded_jwt = encode_jwt({"exp": exp, "nbf": now, "sub": email})
     return encoded_jwt
 
 
@@ -228,10 +247,10 @@ def verify_password_reset_token(token: str) -> str | None:
         None: If the token is invalid or expired. 
 
     Raises:
-        JWTError: If there's an error during token decoding. 
+        InvalidTokenError: If there's an error during token decoding. 
     """
     try:
         decoded_token = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
         return str(decoded_token["sub"])
-    except JWTError:
+    except InvalidTokenError:
         return None